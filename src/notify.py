@@ -10,42 +10,146 @@ This script:
 """
 
 import argparse
+import atexit
+import functools
+import json
+import logging
 import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler
+from pathlib import Path
 from typing import Dict, List, Optional
 
-import gitlab
 import yaml
 
-# Import Slack SDK (try/except for graceful degradation)
+# Prefer the libyaml-backed loader when PyYAML was built with it
 try:
-    from slack_sdk import WebClient
-    from slack_sdk.errors import SlackApiError
-    SLACK_AVAILABLE = True
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# TOML config files are supported natively on Python 3.11+
+try:
+    import tomllib
 except ImportError:
-    SLACK_AVAILABLE = False
-    print("Warning: slack_sdk not installed. Run 'pip install slack_sdk' to enable Slack notifications.")
+    tomllib = None
+
+# Buffer log output and write it in one go (on exit or on the first error)
+# instead of issuing a write per message
+log = logging.getLogger('notify')
+log.setLevel(logging.INFO)
+log.propagate = False
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_handler = MemoryHandler(capacity=1000, flushLevel=logging.WARNING, target=_stream_handler)
+log.addHandler(_log_handler)
+atexit.register(_log_handler.flush)
+
+# Maximum number of concurrent Slack DM requests
+MAX_SLACK_WORKERS = 8
+
+# Pattern for ${VAR} references in config values
+ENV_VAR_PATTERN = re.compile(r'\$\{([A-Za-z0-9_]+)\}')
+
+# CODEOWNERS comment lines and "@user" owner tokens (whitespace-delimited)
+COMMENT_LINE_PATTERN = re.compile(r'^#.*$', re.MULTILINE)
+OWNER_PATTERN = re.compile(r'(?<!\S)@(\S+)')
+
+# Candidate CODEOWNERS locations, in order of preference
+CODEOWNERS_PATHS = ("CODEOWNERS", ".gitlab/CODEOWNERS", "docs/CODEOWNERS")
+
+# Fetches the default branch and every candidate CODEOWNERS blob in one request
+CODEOWNERS_GRAPHQL_QUERY = """
+query($path: ID!, $ref: String, $paths: [String!]!) {
+  project(fullPath: $path) {
+    repository {
+      rootRef
+      blobs(ref: $ref, paths: $paths) {
+        nodes { path oid rawTextBlob }
+      }
+    }
+  }
+}
+"""
+
+# Static Slack message blocks, shared read-only across notifications
+MESSAGE_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "🔄 Revisão Necessária",
+        "emoji": True
+    }
+}
+NOTIFICATION_TEXT_TEMPLATE = "Revisão necessária para MR em {repo}"
+MESSAGE_TEXT_TEMPLATE = "Uma MR em *{repo}* requer sua revisão.\n\n*Título:* {title}\n*Autor:* {author}"
+VIEW_MR_BUTTON_TEXT = {
+    "type": "plain_text",
+    "text": "Ver MR",
+    "emoji": True
+}
+FALLBACK_NOTICE_BLOCK = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": "⚠️ *Não foi possível notificar os revisores diretamente.*"
+    }
+}
+
+# Local cache of parsed CODEOWNERS files, keyed by repository, branch and path
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'codeowners-rotator'
+CODEOWNERS_CACHE_FILE = CACHE_DIR / '_codeowners_cache.json'
+
+# Local cache of Slack channel name -> channel ID
+SLACK_CHANNEL_CACHE_FILE = CACHE_DIR / 'slack_channels.json'
+
+
+def _substitute_env_vars(text):
+    """Replace ${VAR} references in a single string."""
+    return ENV_VAR_PATTERN.sub(lambda m: os.environ.get(m.group(1), ''), text)
 
 
 def resolve_env_vars(value):
-    """Resolve environment variables in string values using ${VAR} syntax."""
+    """Resolve environment variables in string values using ${VAR} syntax.
+
+    Nested dicts and lists are walked with an explicit stack and updated in
+    place, so deep configs don't pay per-node call overhead or recursion limits.
+    """
     if isinstance(value, str):
-        pattern = r'\${([A-Za-z0-9_]+)}'
-        matches = re.findall(pattern, value)
-        
-        result = value
-        for var_name in matches:
-            env_value = os.environ.get(var_name, '')
-            result = result.replace(f'${{{var_name}}}', env_value)
-        
-        return result
-    elif isinstance(value, dict):
-        return {k: resolve_env_vars(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [resolve_env_vars(item) for item in value]
-    else:
-        return value
+        return _substitute_env_vars(value)
+
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+
+        for key, item in items:
+            if isinstance(item, str):
+                node[key] = _substitute_env_vars(item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+
+    return value
+
+
+@functools.cache
+def _slack_available():
+    """Check whether slack_sdk is installed, importing it only on first use."""
+    try:
+        import slack_sdk  # noqa: F401
+        return True
+    except ImportError:
+        log.warning("Warning: slack_sdk not installed. Run 'pip install slack_sdk' to enable Slack notifications.")
+        return False
 
 
 def load_config(config_path=None):
@@ -55,10 +159,17 @@ def load_config(config_path=None):
     # Try to load from file if provided
     if config_path:
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            if config_path.endswith('.toml'):
+                if tomllib is None:
+                    log.error("Error: TOML config files require Python 3.11 or newer")
+                    sys.exit(1)
+                with open(config_path, 'rb') as f:
+                    config = tomllib.load(f)
+            else:
+                with open(config_path, 'r') as f:
+                    config = yaml.load(f.read(), Loader=YamlLoader)
         except Exception as e:
-            print(f"Error loading config file: {e}")
+            log.error(f"Error loading config file: {e}")
             sys.exit(1)
 
     # Resolve environment variables in the config
@@ -73,12 +184,13 @@ def load_config(config_path=None):
         config.setdefault('notification', {})['slack_token'] = os.environ['SLACK_TOKEN']
     
     # Validate configuration
-    if not config.get('gitlab', {}).get('token'):
-        print("Error: GitLab token is required")
+    gitlab_cfg = config.get('gitlab') or {}
+    if not gitlab_cfg.get('token'):
+        log.error("Error: GitLab token is required")
         sys.exit(1)
     
-    if not config.get('notification', {}).get('slack_token') and SLACK_AVAILABLE:
-        print("Error: Slack token is required for notifications")
+    if _slack_available() and not config.get('notification', {}).get('slack_token'):
+        log.error("Error: Slack token is required for notifications")
         sys.exit(1)
         
     return config
@@ -86,123 +198,244 @@ def load_config(config_path=None):
 
 def get_default_branch(project):
     """Get the default branch for a GitLab project."""
+    import gitlab
+
     try:
-        return project.default_branch
-    except:
-        # Fall back to main or master if we can't get the default branch
-        try:
-            project.branches.get('main')
-            return 'main'
-        except:
+        if project.default_branch:
+            return project.default_branch
+    except (AttributeError, gitlab.exceptions.GitlabError):
+        pass
+
+    # Fall back to main or master if we can't get the default branch, using a
+    # single prefix-anchored branch search instead of one lookup per candidate
+    try:
+        names = {branch.name for branch in project.branches.list(search='^ma', get_all=True, per_page=100)}
+    except gitlab.exceptions.GitlabError:
+        names = set()
+
+    for candidate in ('main', 'master'):
+        if candidate in names:
+            return candidate
+
+    log.warning("Could not determine default branch, using 'main'")
+    return 'main'
+
+
+def load_cache(cache_file):
+    """Load a JSON cache file, returning an empty dict if missing, unreadable or not an object."""
+    try:
+        with open(cache_file, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(cache_file, data):
+    """Atomically write a JSON cache file (tempfile + os.replace)."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        log.warning(f"Warning: Could not write cache file {cache_file}: {e}")
+
+
+def parse_codeowners(codeowners_content):
+    """Extract the unique reviewer usernames from CODEOWNERS content."""
+    # Drop comment lines (if any), then pull every "@user" token in one regex sweep
+    content = codeowners_content
+    if '#' in content:
+        content = COMMENT_LINE_PATTERN.sub('', content)
+    return list(dict.fromkeys(OWNER_PATTERN.findall(content)))
+
+
+def find_codeowners_reviewers(project, repo_name, branch):
+    """Locate the CODEOWNERS file in a branch and return its reviewers.
+
+    A HEAD request is used to read the blob SHA of each candidate path; when it
+    matches the on-disk cache the file is not downloaded or parsed again.
+
+    Returns:
+        List of reviewer usernames, or None if no CODEOWNERS file was found
+    """
+    cache = load_cache(CODEOWNERS_CACHE_FILE)
+
+    # Probe all candidate paths concurrently, then take the first hit in
+    # preference order
+    found = None
+    with ThreadPoolExecutor(max_workers=len(CODEOWNERS_PATHS)) as executor:
+        futures = [executor.submit(project.files.head, path, ref=branch) for path in CODEOWNERS_PATHS]
+        for path, future in zip(CODEOWNERS_PATHS, futures):
             try:
-                project.branches.get('master')
-                return 'master'
-            except:
-                print("Could not determine default branch, using 'main'")
-                return 'main'
+                found = path, future.result()
+                break
+            except Exception:
+                continue
+
+    if not found:
+        return None
+
+    path, headers = found
+    log.info(f"Found CODEOWNERS at {path}")
+    cache_key = f"{repo_name}@{branch}:{path}"
+    blob_id = headers.get('X-Gitlab-Blob-Id')
+    entry = cache.get(cache_key)
+    if blob_id and entry and entry.get('sha') == blob_id:
+        log.info(f"Using cached CODEOWNERS (blob {blob_id})")
+        return entry['reviewers']
+
+    # Raw endpoint: plain bytes, no base64 JSON wrapping
+    raw_content = project.files.raw(file_path=path, ref=branch)
+    reviewers = parse_codeowners(raw_content.decode('utf-8'))
+
+    if blob_id:
+        cache[cache_key] = {"sha": blob_id, "reviewers": reviewers}
+        save_cache(CODEOWNERS_CACHE_FILE, cache)
+
+    return reviewers
+
+
+def fetch_codeowners_graphql(gl, repo_name, branch=None):
+    """Fetch CODEOWNERS for a project in a single GitLab GraphQL request.
+
+    Resolves the default branch and reads all candidate paths in one round-trip.
+
+    Args:
+        gl: GitLab client instance
+        repo_name: Repository name (namespace/project)
+        branch: Branch to read from, or None for the default branch
+
+    Returns:
+        Tuple of (branch, path, blob_id, content), or None if no CODEOWNERS file exists
+
+    Raises:
+        Exception if the request fails or the project cannot be resolved
+    """
+    response = gl.session.post(
+        f"{gl.url.rstrip('/')}/api/graphql",
+        headers={'Authorization': f"Bearer {gl.private_token}"},
+        json={
+            'query': CODEOWNERS_GRAPHQL_QUERY,
+            'variables': {'path': repo_name, 'ref': branch, 'paths': list(CODEOWNERS_PATHS)}
+        },
+        timeout=10
+    )
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get('errors'):
+        raise RuntimeError(payload['errors'][0].get('message', 'unknown GraphQL error'))
+
+    project = (payload.get('data') or {}).get('project')
+    if not project:
+        raise RuntimeError(f"Project {repo_name} not found via GraphQL")
+
+    branch = branch or project['repository']['rootRef']
+    nodes = {node['path']: node for node in project['repository']['blobs']['nodes'] if node}
+    for path in CODEOWNERS_PATHS:
+        node = nodes.get(path)
+        if node and node.get('rawTextBlob') is not None:
+            return branch, path, node.get('oid'), node['rawTextBlob']
+
+    return None
 
 
-def get_codeowners_from_repo(gl, repo_name, mr_info=None):
+def get_codeowners_from_repo(gl, repo_name, mr_info=None, config=None):
     """Get current CODEOWNERS information from the repository.
     
     Args:
         gl: GitLab client instance
         repo_name: Repository name (namespace/project)
         mr_info: Optional merge request info with 'source_branch' for MR-specific CODEOWNERS
+        config: Already loaded configuration, reused by the rotation state fallback
         
     Returns:
         List of reviewer usernames
     """
     try:
-        # Get the project
-        project = gl.projects.get(repo_name)
-        
         # Determine which branch to use
         branch = None
         if mr_info and mr_info.get('source_branch'):
             branch = mr_info.get('source_branch')
+
+        try:
+            # Resolve branch and CODEOWNERS contents in a single GraphQL request
+            found = fetch_codeowners_graphql(gl, repo_name, branch)
+            if found:
+                branch, path, _, content = found
+                log.info(f"Found CODEOWNERS at {path} in branch {branch} (GraphQL)")
+                # GraphQL always returns the full blob, so the blob-SHA cache
+                # (which only saves REST downloads) is left to the REST path
+                reviewers = parse_codeowners(content)
+            else:
+                reviewers = None
+        except Exception as e:
+            log.warning(f"GraphQL CODEOWNERS lookup failed, falling back to REST API: {e}")
+
+            # Get the project
+            project = gl.projects.get(repo_name)
+
+            # If no branch specified or branch doesn't exist, use default branch
+            if not branch:
+                branch = get_default_branch(project)
+
+            log.info(f"Looking for CODEOWNERS in branch: {branch}")
+
+            # Try to find CODEOWNERS file
+            reviewers = find_codeowners_reviewers(project, repo_name, branch)
         
-        # If no branch specified or branch doesn't exist, use default branch
-        if not branch:
-            branch = get_default_branch(project)
-            
-        print(f"Looking for CODEOWNERS in branch: {branch}")
-        
-        # Try to find CODEOWNERS file
-        codeowners_content = None
-        for path in ["CODEOWNERS", ".gitlab/CODEOWNERS", "docs/CODEOWNERS"]:
-            try:
-                file_info = project.files.get(path, ref=branch)
-                codeowners_content = file_info.decode().decode('utf-8')
-                print(f"Found CODEOWNERS at {path}")
-                break
-            except Exception as e:
-                continue
-        
-        if not codeowners_content:
-            print(f"No CODEOWNERS file found in {repo_name}")
+        if reviewers is None:
+            log.warning(f"No CODEOWNERS file found in {repo_name}")
             
             # Fall back to checking for rotation_state.json
             try:
+                # rotate prints directly to stdout; flush buffered logs first to keep ordering
+                _log_handler.flush()
                 from rotate import load_rotation_state  # Import here to avoid circular dependency
                 
                 # Try to load the rotation state to get current reviewers
-                config = load_config()
-                state = load_rotation_state(config)
+                config = config or load_config()
+                if '_cached_state' not in config:
+                    config['_cached_state'] = load_rotation_state(config)
+                state = config['_cached_state']
                 if state and 'reviewers' in state and state['reviewers']:
-                    print(f"Using reviewers from rotation state: {', '.join(state['reviewers'])}")
+                    log.info(f"Using reviewers from rotation state: {', '.join(state['reviewers'])}")
                     return state['reviewers']
             except Exception as e:
-                print(f"Could not load reviewers from rotation state: {e}")
+                log.warning(f"Could not load reviewers from rotation state: {e}")
             
             return []
         
-        # Extract reviewer usernames
-        reviewers = []
-        for line in codeowners_content.splitlines():
-            # Skip comments and empty lines
-            if not line or line.startswith("#"):
-                continue
-            
-            # Extract usernames (format: "* @user1 @user2")
-            parts = line.split()
-            for part in parts:
-                if part.startswith("@"):
-                    reviewers.append(part[1:])  # Remove @
-        
-        # Remove duplicates while preserving order
-        unique_reviewers = []
-        for reviewer in reviewers:
-            if reviewer not in unique_reviewers:
-                unique_reviewers.append(reviewer)
-        
-        return unique_reviewers
+        return reviewers
         
     except Exception as e:
-        print(f"Error getting CODEOWNERS from {repo_name}: {e}")
+        log.error(f"Error getting CODEOWNERS from {repo_name}: {e}")
         return []
 
 
-def map_gitlab_to_slack(username, user_mapping):
-    """Map a GitLab username to a Slack user ID using explicit mapping.
-    
-    Args:
-        username: GitLab username
-        user_mapping: Dictionary mapping GitLab usernames to Slack user IDs
-        
+def find_slack_channel_id(slack_client, channel_name):
+    """Find a Slack channel ID by name, paging through conversations_list.
+
     Returns:
-        Slack user ID or None if not found in mapping
+        Channel ID or None if no channel with that name exists
     """
-    if not user_mapping:
-        return None
-        
-    if username in user_mapping:
-        slack_id = user_mapping[username]
-        print(f"Found Slack user in mapping for {username}: {slack_id}")
-        return slack_id
-    
-    print(f"No mapping found for GitLab user: {username}")
-    return None
+    cursor = None
+    while True:
+        response = slack_client.conversations_list(
+            types="public_channel,private_channel",
+            exclude_archived=True,
+            limit=1000,
+            cursor=cursor
+        )
+        for channel in response.get('channels', []):
+            if channel['name'] == channel_name:
+                return channel['id']
+
+        cursor = response.get('response_metadata', {}).get('next_cursor')
+        if not cursor:
+            return None
 
 
 def notify_slack(slack_client, reviewers, mr_info, fallback_channel=None):
@@ -217,12 +450,14 @@ def notify_slack(slack_client, reviewers, mr_info, fallback_channel=None):
     Returns:
         True if any notification was sent successfully
     """
-    if not SLACK_AVAILABLE or not slack_client:
-        print("Slack notifications not available")
+    if not _slack_available() or not slack_client:
+        log.warning("Slack notifications not available")
         return False
+
+    from slack_sdk.errors import SlackApiError
     
     if not reviewers and not fallback_channel:
-        print("No reviewers or fallback channel specified")
+        log.warning("No reviewers or fallback channel specified")
         return False
     
     # Format message blocks
@@ -232,20 +467,14 @@ def notify_slack(slack_client, reviewers, mr_info, fallback_channel=None):
     mr_author = mr_info.get('author', 'Unknown')
     mr_id = mr_info.get('id', 'Unknown')
     
+    notification_text = NOTIFICATION_TEXT_TEMPLATE.format(repo=repo_name)
     blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "🔄 Revisão Necessária",
-                "emoji": True
-            }
-        },
+        MESSAGE_HEADER_BLOCK,
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": f"Uma MR em *{repo_name}* requer sua revisão.\n\n*Título:* {mr_title}\n*Autor:* {mr_author}"
+                "text": MESSAGE_TEXT_TEMPLATE.format(repo=repo_name, title=mr_title, author=mr_author)
             }
         },
         {
@@ -253,11 +482,7 @@ def notify_slack(slack_client, reviewers, mr_info, fallback_channel=None):
             "elements": [
                 {
                     "type": "button",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Ver MR",
-                        "emoji": True
-                    },
+                    "text": VIEW_MR_BUTTON_TEXT,
                     "url": mr_url,
                     "style": "primary",
                     "action_id": "view_mr"
@@ -266,175 +491,284 @@ def notify_slack(slack_client, reviewers, mr_info, fallback_channel=None):
         }
     ]
     
-    # Send to each reviewer
+    def _notify_one(user_id):
+        """Open a DM with a single reviewer and post the message.
+
+        Returns:
+            Tuple of (user_id, ok)
+        """
+        for attempt in range(2):
+            try:
+                # Open DM channel
+                response = slack_client.conversations_open(users=user_id)
+                if not response['ok']:
+                    log.warning(f"Failed to open DM with user {user_id}: {response['error']}")
+                    return user_id, False
+
+                channel_id = response['channel']['id']
+
+                # Send message
+                slack_client.chat_postMessage(
+                    channel=channel_id,
+                    text=notification_text,
+                    blocks=blocks
+                )
+
+                log.info(f"Sent notification to Slack user {user_id}")
+                return user_id, True
+
+            except SlackApiError as e:
+                # Back off once when Slack rate limits the workspace
+                if e.response.status_code == 429 and attempt == 0:
+                    # slack_sdk passes headers as a plain dict, so match the name case-insensitively
+                    retry_after = int(next(
+                        (v for k, v in e.response.headers.items() if k.lower() == 'retry-after'), 1
+                    ))
+                    log.warning(f"Rate limited by Slack, retrying {user_id} in {retry_after}s")
+                    time.sleep(retry_after)
+                    continue
+                log.error(f"Error sending Slack notification to {user_id}: {e}")
+                return user_id, False
+
+        return user_id, False
+
+    # Send to each reviewer in parallel (capped to stay within Slack rate limits)
     successful = False
-    notified_users = []
-    
-    for user_id in reviewers:
-        try:
-            # Open DM channel
-            response = slack_client.conversations_open(users=user_id)
-            if not response['ok']:
-                print(f"Failed to open DM with user {user_id}: {response['error']}")
-                continue
-                
-            channel_id = response['channel']['id']
-            
-            # Send message
-            slack_client.chat_postMessage(
-                channel=channel_id,
-                text=f"Revisão necessária para MR em {repo_name}",
-                blocks=blocks
-            )
-            
-            print(f"Sent notification to Slack user {user_id}")
-            successful = True
-            notified_users.append(user_id)
-            
-        except SlackApiError as e:
-            print(f"Error sending Slack notification to {user_id}: {e}")
-    
+    if reviewers:
+        with ThreadPoolExecutor(max_workers=min(MAX_SLACK_WORKERS, len(reviewers))) as executor:
+            results = list(executor.map(_notify_one, reviewers))
+
+        successful = any(ok for _, ok in results)
+
     # Fall back to channel if no direct messages were sent
     if not successful and fallback_channel:
         try:
             # Add note about fallback
-            fallback_blocks = blocks.copy()
-            fallback_blocks.insert(1, {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "⚠️ *Não foi possível notificar os revisores diretamente.*"
-                }
-            })
+            fallback_blocks = [blocks[0], FALLBACK_NOTICE_BLOCK] + blocks[1:]
             
             # Send to fallback channel
+            channel_cache = load_cache(SLACK_CHANNEL_CACHE_FILE)
             try:
                 # Send directly to the channel by name (with or without #)
                 channel_name = fallback_channel
                 if channel_name.startswith('#'):
                     channel_name = channel_name[1:]
                 
-                print(f"Sending to fallback channel: {channel_name}")
+                log.info(f"Sending to fallback channel: {channel_name}")
                 
-                # Try posting message
-                slack_client.chat_postMessage(
-                    channel=channel_name,
-                    text=f"Revisão necessária para MR em {repo_name}",
+                # Try posting message, using the cached channel ID when known
+                response = slack_client.chat_postMessage(
+                    channel=channel_cache.get(channel_name, channel_name),
+                    text=notification_text,
                     blocks=fallback_blocks
                 )
                 
-                print(f"Sent notification to fallback channel {fallback_channel}")
+                log.info(f"Sent notification to fallback channel {fallback_channel}")
                 successful = True
+
+                if channel_cache.get(channel_name) != response['channel']:
+                    channel_cache[channel_name] = response['channel']
+                    save_cache(SLACK_CHANNEL_CACHE_FILE, channel_cache)
             except SlackApiError as e:
                 error_message = e.response.get('error', 'unknown_error')
-                print(f"Error sending to channel by name: {error_message}")
+                log.error(f"Error sending to channel by name: {error_message}")
                 
                 # If channel name didn't work, try these fallbacks
                 if error_message == "channel_not_found":
-                    print("Trying to find channel by listing channels...")
+                    log.info("Trying to find channel by listing channels...")
                     try:
                         # Try to find channel ID from name
-                        channels_response = slack_client.conversations_list(types="public_channel,private_channel")
-                        for channel in channels_response.get('channels', []):
-                            if channel['name'] == channel_name:
-                                # Found the channel, try posting again
-                                slack_client.chat_postMessage(
-                                    channel=channel['id'],
-                                    text=f"Revisão necessária para MR em {repo_name}",
-                                    blocks=fallback_blocks
-                                )
-                                print(f"Sent notification to fallback channel {channel['name']} ({channel['id']})")
-                                successful = True
-                                break
+                        channel_id = find_slack_channel_id(slack_client, channel_name)
+                        if channel_id:
+                            # Found the channel, try posting again
+                            slack_client.chat_postMessage(
+                                channel=channel_id,
+                                text=notification_text,
+                                blocks=fallback_blocks
+                            )
+                            log.info(f"Sent notification to fallback channel {channel_name} ({channel_id})")
+                            successful = True
+
+                            channel_cache[channel_name] = channel_id
+                            save_cache(SLACK_CHANNEL_CACHE_FILE, channel_cache)
                     except SlackApiError as e2:
-                        print(f"Error listing channels: {e2}")
+                        log.error(f"Error listing channels: {e2}")
             
         except Exception as e:
-            print(f"Error sending to fallback channel: {e}")
-            print("IMPORTANT: Please ensure the fallback_channel name is correct and the bot is a member of the channel")
+            log.error(f"Error sending to fallback channel: {e}")
+            log.error("IMPORTANT: Please ensure the fallback_channel name is correct and the bot is a member of the channel")
     
     return successful
 
 
+def create_http_session():
+    """Create a keep-alive HTTP session with a bounded connection pool and retries."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def notify_merge_request(gl, slack_client, config, mr_info, force_notify=False):
+    """Notify the CODEOWNERS of a single merge request.
+
+    Args:
+        gl: GitLab client instance
+        slack_client: Slack WebClient instance (or None)
+        config: Loaded configuration
+        mr_info: Merge request information
+        force_notify: Notify the fallback channel even if no reviewers are found
+
+    Returns:
+        True if a notification was sent
+    """
+    # Get CODEOWNERS from the repository
+    codeowners = get_codeowners_from_repo(gl, mr_info['repo'], mr_info, config=config)
+    
+    if not codeowners and not force_notify:
+        log.error("No reviewers found in CODEOWNERS")
+        return False
+    
+    if codeowners:
+        log.info(f"Found reviewers in CODEOWNERS: {', '.join(codeowners)}")
+    
+    # Map GitLab users to Slack users using explicit mapping
+    user_mapping = config.get('notification', {}).get('user_mapping') or {}
+    fallback_channel = config.get('notification', {}).get('fallback_channel')
+    
+    if not user_mapping:
+        log.warning("Warning: No user_mapping configured in config.yaml")
+        log.warning("You must add a 'user_mapping' section to map GitLab users to Slack IDs")
+    
+    slack_users = [user_mapping[username] for username in codeowners if user_mapping.get(username)]
+    unmapped = [username for username in codeowners if not user_mapping.get(username)]
+    if slack_users:
+        log.info(f"Mapped {len(slack_users)} GitLab users to Slack IDs: {', '.join(slack_users)}")
+    if unmapped:
+        log.warning(f"No mapping found for GitLab users: {', '.join(unmapped)}")
+    
+    # Send notification
+    if slack_client and (slack_users or fallback_channel):
+        if notify_slack(slack_client, slack_users, mr_info, fallback_channel):
+            log.info("Notification sent successfully")
+            return True
+        log.error("Failed to send notification")
+        return False
+
+    log.error("No Slack users found to notify and no fallback channel configured")
+    return False
+
+
+def run_daemon(gl, slack_client, config, stream):
+    """Process merge request events, one JSON object per line, reusing clients.
+
+    Each event uses the same keys as the merge request info ('repo', 'id',
+    'title', 'url', 'author', 'source_branch') plus an optional 'force_notify'.
+    """
+    log.info("Daemon mode: waiting for merge request events on stdin")
+    _log_handler.flush()
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            event = json.loads(line)
+            mr_info = {
+                'repo': event['repo'],
+                'id': event.get('id', 'Unknown'),
+                'title': event.get('title', 'Untitled merge request'),
+                'url': event.get('url', '#'),
+                'author': event.get('author', 'Unknown'),
+                'source_branch': event.get('source_branch')
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            log.error(f"Invalid merge request event: {e}")
+            continue
+
+        # Rotation state may change while the daemon runs, so don't reuse it
+        config.pop('_cached_state', None)
+
+        try:
+            notify_merge_request(gl, slack_client, config, mr_info, event.get('force_notify', False))
+        except Exception as e:
+            log.error(f"Error processing merge request event for {mr_info['repo']}: {e}")
+        _log_handler.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Notify CODEOWNERS about merge requests via Slack')
     parser.add_argument('--config', '-c', help='Path to config file')
-    parser.add_argument('--repo', '-r', required=True, help='Repository name (namespace/project)')
-    parser.add_argument('--mr-id', '-m', required=True, help='Merge request ID')
-    parser.add_argument('--mr-title', '-t', required=True, help='Merge request title')
-    parser.add_argument('--mr-url', '-u', required=True, help='Merge request URL')
-    parser.add_argument('--mr-author', '-a', required=True, help='Merge request author')
+    parser.add_argument('--repo', '-r', help='Repository name (namespace/project)')
+    parser.add_argument('--mr-id', '-m', help='Merge request ID')
+    parser.add_argument('--mr-title', '-t', help='Merge request title')
+    parser.add_argument('--mr-url', '-u', help='Merge request URL')
+    parser.add_argument('--mr-author', '-a', help='Merge request author')
     parser.add_argument('--mr-source-branch', '-b', help='Merge request source branch')
     parser.add_argument('--force-notify', '-f', action='store_true', help='Force notification to fallback channel even if no reviewers found')
+    parser.add_argument('--daemon', action='store_true', help='Keep running and read merge request events (JSON lines) from stdin')
     args = parser.parse_args()
 
+    if not args.daemon:
+        required = ['repo', 'mr_id', 'mr_title', 'mr_url', 'mr_author']
+        missing = ['--' + name.replace('_', '-') for name in required if not getattr(args, name)]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+
     # Load configuration
     config = load_config(args.config)
-    
-    # Prepare MR info
-    mr_info = {
-        'repo': args.repo,
-        'id': args.mr_id,
-        'title': args.mr_title,
-        'url': args.mr_url,
-        'author': args.mr_author,
-        'source_branch': args.mr_source_branch
-    }
 
-    # Setup GitLab client
+    import gitlab
+
+    # Setup GitLab client (a single keep-alive session shared by all API calls)
+    gitlab_cfg = config['gitlab']
     try:
-        gl = gitlab.Gitlab(url=config['gitlab']['url'], private_token=config['gitlab']['token'])
+        gl = gitlab.Gitlab(url=gitlab_cfg['url'], private_token=gitlab_cfg['token'], session=create_http_session())
         gl.auth()
-        print(f"Authenticated with GitLab at {config['gitlab']['url']}")
+        log.info(f"Authenticated with GitLab at {gitlab_cfg['url']}")
     except Exception as e:
-        print(f"Error connecting to GitLab: {e}")
+        log.error(f"Error connecting to GitLab: {e}")
         sys.exit(1)
     
     # Setup Slack client
     slack_client = None
-    if SLACK_AVAILABLE:
+    if _slack_available():
+        from slack_sdk import WebClient
+
         try:
             slack_token = config.get('notification', {}).get('slack_token')
             if slack_token:
-                slack_client = WebClient(token=slack_token)
+                slack_client = WebClient(token=slack_token, timeout=10)
                 test = slack_client.auth_test()
-                print(f"Authenticated with Slack as {test['user']}")
+                log.info(f"Authenticated with Slack as {test['user']}")
         except Exception as e:
-            print(f"Error connecting to Slack: {e}")
-    
-    # Get CODEOWNERS from the repository
-    codeowners = get_codeowners_from_repo(gl, args.repo, mr_info)
-    
-    if not codeowners and not args.force_notify:
-        print("No reviewers found in CODEOWNERS")
-        sys.exit(1)
-    
-    if codeowners:
-        print(f"Found reviewers in CODEOWNERS: {', '.join(codeowners)}")
-    
-    # Map GitLab users to Slack users using explicit mapping
-    slack_users = []
-    user_mapping = config.get('notification', {}).get('user_mapping', {})
-    fallback_channel = config.get('notification', {}).get('fallback_channel')
-    
-    if not user_mapping:
-        print("Warning: No user_mapping configured in config.yaml")
-        print("You must add a 'user_mapping' section to map GitLab users to Slack IDs")
-    
-    for username in codeowners:
-        slack_id = map_gitlab_to_slack(username, user_mapping)
-        if slack_id:
-            slack_users.append(slack_id)
-    
-    # Send notification
-    if slack_client and (slack_users or fallback_channel):
-        if notify_slack(slack_client, slack_users, mr_info, fallback_channel):
-            print("Notification sent successfully")
-        else:
-            print("Failed to send notification")
-            sys.exit(1)
-    else:
-        print("No Slack users found to notify and no fallback channel configured")
+            log.error(f"Error connecting to Slack: {e}")
+
+    if args.daemon:
+        run_daemon(gl, slack_client, config, sys.stdin)
+        return
+
+    # Prepare MR info
+    mr_info = {
+        'repo': args.repo,
+        'id': args.mr_id,
+        'title': args.mr_title,
+        'url': args.mr_url,
+        'author': args.mr_author,
+        'source_branch': args.mr_source_branch
+    }
+
+    if not notify_merge_request(gl, slack_client, config, mr_info, args.force_notify):
         sys.exit(1)
 
 
@@ -4,25 +4,63 @@ Simple script to rotate CODEOWNERS in GitLab repositories.
 """
 
 import argparse
+import functools
 import json
 import os
 import re
 import sys
+import tempfile
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Any, Union
+from urllib.parse import quote
 
 import gitlab
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Import GCS library (only if needed)
+# Prefer the libyaml-backed loader when PyYAML was built with it
 try:
-    from google.cloud import storage
-    from google.cloud.exceptions import GoogleCloudError
-    GCS_AVAILABLE = True
+    from yaml import CSafeLoader as YamlLoader
 except ImportError:
-    GCS_AVAILABLE = False
+    from yaml import SafeLoader as YamlLoader
+
+# TOML config files are supported natively on Python 3.11+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+# Use orjson for state (de)serialization when installed (falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# GCS client and bucket handles, shared between state load and save
+_gcs_client = None
+_gcs_buckets = {}
+
+# Local copy of the GCS rotation state, revalidated by ETag on load
+STATE_CACHE_FILE = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'codeowners-rotator' / 'state.json'
+
+# Top-level keys every config must define
+REQUIRED_CONFIG_KEYS = frozenset({'gitlab', 'repositories', 'reviewers'})
+
+# Pattern for ${VAR} references in config values
+ENV_VAR_PATTERN = re.compile(r'\$\{([A-Za-z0-9_]+)\}')
+
+# Candidate CODEOWNERS locations, in order of preference
+CODEOWNERS_PATHS = ("CODEOWNERS", ".gitlab/CODEOWNERS", "docs/CODEOWNERS")
+
+# Maximum number of repositories updated concurrently
+MAX_UPDATE_WORKERS = 16
 
 
 def resolve_env_vars(value: Any) -> Any:
@@ -33,28 +71,36 @@ def resolve_env_vars(value: Any) -> Any:
         value: Value to process (can be string, dict, list, or other types)
 
     Returns:
-        Value with environment variables resolved
+        Value with environment variables resolved (containers without any
+        references are returned unchanged rather than copied)
     """
     if isinstance(value, str):
-        # Define pattern for ${VAR} syntax
-        pattern = r'\${([A-Za-z0-9_]+)}'
+        # Skip the regex entirely for strings without references
+        if '${' not in value:
+            return value
 
-        # Find all environment variable references
-        matches = re.findall(pattern, value)
-
-        # Replace each match with the environment variable value
-        result = value
-        for var_name in matches:
-            env_value = os.environ.get(var_name, '')
-            result = result.replace(f'${{{var_name}}}', env_value)
-
-        return result
+        # Replace every ${VAR} reference in a single pass
+        return ENV_VAR_PATTERN.sub(lambda m: os.environ.get(m.group(1), ''), value)
     elif isinstance(value, dict):
-        # Process recursively for dictionaries
-        return {k: resolve_env_vars(v) for k, v in value.items()}
+        # Process recursively for dictionaries, copying only once a value changes
+        resolved = None
+        for k, v in value.items():
+            new_value = resolve_env_vars(v)
+            if new_value is not v:
+                if resolved is None:
+                    resolved = dict(value)
+                resolved[k] = new_value
+        return value if resolved is None else resolved
     elif isinstance(value, list):
-        # Process recursively for lists
-        return [resolve_env_vars(item) for item in value]
+        # Process recursively for lists, copying only once an item changes
+        resolved = None
+        for i, item in enumerate(value):
+            new_item = resolve_env_vars(item)
+            if new_item is not item:
+                if resolved is None:
+                    resolved = list(value)
+                resolved[i] = new_item
+        return value if resolved is None else resolved
     else:
         # Return other types as is
         return value
@@ -67,8 +113,15 @@ def load_config(config_path=None):
     # Try to load from file if provided
     if config_path:
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            if config_path.endswith('.toml'):
+                if tomllib is None:
+                    print("Error: TOML config files require Python 3.11 or newer")
+                    sys.exit(1)
+                with open(config_path, 'rb') as f:
+                    config = tomllib.load(f)
+            else:
+                with open(config_path, 'r') as f:
+                    config = yaml.load(f.read(), Loader=YamlLoader)
         except Exception as e:
             print(f"Error loading config file: {e}")
             sys.exit(1)
@@ -92,20 +145,98 @@ def load_config(config_path=None):
         config.setdefault('storage', {})['bucket'] = os.environ['GCS_BUCKET']
 
     # Basic validation
-    required = ['gitlab', 'repositories', 'reviewers']
-    missing = [key for key in required if key not in config]
+    missing = REQUIRED_CONFIG_KEYS - config.keys()
     if missing:
-        print(f"Missing required configuration: {', '.join(missing)}")
+        print(f"Missing required configuration: {', '.join(sorted(missing))}")
         sys.exit(1)
 
     # Check if gitlab token is set
-    if not config.get('gitlab', {}).get('token'):
+    gitlab_cfg = config.get('gitlab') or {}
+    if not gitlab_cfg.get('token'):
         print("Error: GitLab token is required. Set it in config file using ${GITLAB_TOKEN} syntax or set GITLAB_TOKEN environment variable.")
         sys.exit(1)
 
     return config
 
 
+@functools.cache
+def _load_gcs():
+    """Import the GCS library on first use; it is slow to import and only needed for GCS storage.
+
+    Returns:
+        Tuple of (storage, exceptions) modules, or (None, None) if not installed
+    """
+    try:
+        from google.cloud import exceptions, storage
+        return storage, exceptions
+    except ImportError:
+        return None, None
+
+
+def _get_gcs_client():
+    """Get the shared GCS client, creating it on first use."""
+    global _gcs_client
+    if _gcs_client is None:
+        storage, _ = _load_gcs()
+        _gcs_client = storage.Client()
+    return _gcs_client
+
+
+def _get_gcs_bucket(bucket_name):
+    """Get a cached GCS bucket handle by name."""
+    if bucket_name not in _gcs_buckets:
+        _gcs_buckets[bucket_name] = _get_gcs_client().bucket(bucket_name)
+    return _gcs_buckets[bucket_name]
+
+
+def dumps_state(state):
+    """Serialize rotation state to indented JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    return json.dumps(state, indent=2).encode('utf-8')
+
+
+def loads_state(data):
+    """Deserialize rotation state from JSON bytes or str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_state_cache(cache_key):
+    """Read the locally cached GCS state for an object.
+
+    Returns:
+        Dict with 'etag' and 'state', or None if there is no usable cache entry
+    """
+    try:
+        with open(STATE_CACHE_FILE, 'rb') as f:
+            cached = loads_state(f.read())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict):
+        return None
+    if cached.get('object') != cache_key or not cached.get('etag'):
+        return None
+    return cached
+
+
+def write_state_cache(cache_key, etag, state):
+    """Atomically store the GCS state and its ETag in the local cache."""
+    if not etag:
+        return
+
+    try:
+        STATE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=STATE_CACHE_FILE.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps_state({"object": cache_key, "etag": etag, "state": state}))
+        os.replace(tmp_path, STATE_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Could not write state cache {STATE_CACHE_FILE}: {e}")
+
+
 def load_rotation_state(config):
     """Load rotation state from either local file or GCS."""
     storage_config = config.get('storage', {})
@@ -121,7 +252,8 @@ def load_rotation_state(config):
     }
 
     if storage_type == 'gcs':
-        if not GCS_AVAILABLE:
+        storage, gcs_exceptions = _load_gcs()
+        if storage is None:
             print("Warning: GCS storage configured but google-cloud-storage package not installed.")
             return default_state
 
@@ -130,18 +262,26 @@ def load_rotation_state(config):
         state_object = f"{prefix.rstrip('/')}/rotation_state.json"
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(state_object)
-
-            if blob.exists():
-                content = blob.download_as_text()
-                state = json.loads(content)
-                print(f"Loaded rotation state from GCS: {bucket_name}/{state_object}")
-                return state
-            else:
-                print(f"No rotation state found in GCS: {bucket_name}/{state_object}")
-                return default_state
+            blob = _get_gcs_bucket(bucket_name).blob(state_object)
+            cache_key = f"{bucket_name}/{state_object}"
+
+            # Serve the locally cached copy if the object's ETag hasn't changed
+            # (a metadata-only request instead of a full download)
+            cached = read_state_cache(cache_key)
+            if cached:
+                blob.reload()
+                if blob.etag == cached['etag']:
+                    print(f"Loaded rotation state from local cache (unchanged in GCS): {cache_key}")
+                    return cached['state']
+
+            # Download directly; a missing object surfaces as NotFound
+            state = loads_state(blob.download_as_bytes())
+            print(f"Loaded rotation state from GCS: {bucket_name}/{state_object}")
+            write_state_cache(cache_key, blob.etag, state)
+            return state
+        except gcs_exceptions.NotFound:
+            print(f"No rotation state found in GCS: {bucket_name}/{state_object}")
+            return default_state
         except Exception as e:
             print(f"Warning: Could not load rotation state from GCS: {e}")
             return default_state
@@ -150,8 +290,8 @@ def load_rotation_state(config):
         state_file = storage_config.get('state_file', 'rotation_state.json')
         if Path(state_file).exists():
             try:
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
+                with open(state_file, 'rb') as f:
+                    state = loads_state(f.read())
                 print(f"Loaded rotation state from file: {state_file}")
                 return state
             except Exception as e:
@@ -168,7 +308,8 @@ def save_rotation_state(config, state):
     storage_type = storage_config.get('type', 'local')
 
     if storage_type == 'gcs':
-        if not GCS_AVAILABLE:
+        storage, _ = _load_gcs()
+        if storage is None:
             print("Warning: GCS storage configured but google-cloud-storage package not installed.")
             return
 
@@ -177,14 +318,12 @@ def save_rotation_state(config, state):
         state_object = f"{prefix.rstrip('/')}/rotation_state.json"
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(state_object)
+            blob = _get_gcs_bucket(bucket_name).blob(state_object)
 
             # Convert to JSON and upload
-            state_json = json.dumps(state, indent=2)
-            blob.upload_from_string(state_json, content_type='application/json')
+            blob.upload_from_string(dumps_state(state), content_type='application/json')
             print(f"Saved rotation state to GCS: {bucket_name}/{state_object}")
+            write_state_cache(f"{bucket_name}/{state_object}", blob.etag, state)
         except Exception as e:
             print(f"Warning: Could not save rotation state to GCS: {e}")
     else:
@@ -195,8 +334,8 @@ def save_rotation_state(config, state):
             os.makedirs(state_dir, exist_ok=True)
 
         try:
-            with open(state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            with open(state_file, 'wb') as f:
+                f.write(dumps_state(state))
             print(f"Saved rotation state to file: {state_file}")
         except Exception as e:
             print(f"Warning: Could not save rotation state file: {e}")
@@ -219,44 +358,53 @@ def get_next_reviewers(config):
 
     # Load current state
     current_state = load_rotation_state(config)
-    rotation_queue = current_state.get('rotation_queue', [])
+    rotation_queue = deque(current_state.get('rotation_queue', []))
 
     # If no rotation queue or empty, initialize with all reviewers
     if not rotation_queue:
-        rotation_queue = all_reviewers.copy()
+        rotation_queue = deque(all_reviewers)
         print(f"Initialized new rotation queue with all reviewers")
     else:
         print(f"Current rotation queue: {', '.join(rotation_queue)}")
 
     # Check if we need to account for new reviewers that weren't in the original queue
+    queued = set(rotation_queue)
     for reviewer in all_reviewers:
-        if reviewer not in rotation_queue:
+        if reviewer not in queued:
             rotation_queue.append(reviewer)
+            queued.add(reviewer)
             print(f"Added new reviewer to queue: {reviewer}")
 
     # Remove reviewers that are no longer in the list of all reviewers
-    rotation_queue = [r for r in rotation_queue if r in all_reviewers]
+    valid_reviewers = set(all_reviewers)
+    rotation_queue = deque(r for r in rotation_queue if r in valid_reviewers)
 
     # Select the next N reviewers from the queue
-    next_reviewers = rotation_queue[:num_reviewers]
+    next_reviewers = list(islice(rotation_queue, num_reviewers))
 
     # Update the queue by moving the selected reviewers to the end
-    rotation_queue = rotation_queue[num_reviewers:] + next_reviewers
+    rotation_queue.rotate(-num_reviewers)
 
     print(f"Updated rotation queue: {', '.join(rotation_queue)}")
 
     # Store the updated queue for later
-    config['_updated_rotation_queue'] = rotation_queue
+    config['_updated_rotation_queue'] = list(rotation_queue)
+
+    # Keep the CODEOWNERS locations found on previous runs
+    config['_codeowners_paths'] = current_state.get('codeowners_paths', {})
 
     return next_reviewers
 
 
-def generate_codeowners_content(reviewers):
+def generate_codeowners_content(reviewers, now=None):
     """Generate content for the CODEOWNERS file."""
+    if now is None:
+        now = datetime.now()
+
     # Create a header with information about the rotation
     header = [
         "# CODEOWNERS file managed by CodeOwners Rotator",
-        f"# Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"# Last updated: {now.strftime('%Y-%m-%d %H:%M:%S')}",
         f"# Current reviewers: {', '.join(reviewers)}",
         ""
     ]
@@ -273,77 +421,197 @@ def get_default_branch(project):
     return project.default_branch
 
 
-def update_repositories(gl, repo_names, reviewers):
-    """Update CODEOWNERS files in multiple repositories."""
-    # Generate new CODEOWNERS content
-    content = generate_codeowners_content(reviewers)
+def prefetch_projects(gl, repo_names):
+    """Fetch project metadata in bulk for groups holding several configured repositories.
 
-    successful = []
-    failed = []
+    One paged group listing replaces a projects.get call per repository. A group
+    is only listed when that costs fewer requests than the per-repo lookups, i.e.
+    the first page reports no more pages than there are configured repositories
+    in it; otherwise (or when GitLab omits the total) the per-repo lookup is used.
 
+    Returns:
+        Dictionary mapping lowercased full project path to project
+    """
+    repos_by_group = defaultdict(set)
     for repo_name in repo_names:
+        # Numeric project IDs have no namespace and are left to the per-repo lookup
+        repo_path = str(repo_name)
+        group, _, _ = repo_path.rpartition('/')
+        if group:
+            repos_by_group[group].add(repo_path.lower())
+
+    projects = {}
+    for group, wanted in repos_by_group.items():
+        if len(wanted) < 2:
+            continue
+
         try:
-            # Get the project
+            group_projects = gl.groups.get(group, lazy=True).projects.list(iterator=True, simple=True, per_page=100)
+            total_pages = group_projects.total_pages
+            if total_pages is None or total_pages > len(wanted):
+                continue
+            for project in group_projects:
+                full_path = project.path_with_namespace.lower()
+                if full_path in wanted:
+                    projects[full_path] = project
+                    wanted.discard(full_path)
+                    if not wanted:
+                        break
+        except Exception as e:
+            print(f"Warning: Could not list projects for group {group}: {e}")
+
+    return projects
+
+
+def create_http_session(retry=None):
+    """Create a keep-alive HTTP session with retries.
+
+    The connection pool is sized to the update thread pool so workers don't wait
+    for a connection (or open a new one per request once the pool is full).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_UPDATE_WORKERS,
+        pool_maxsize=MAX_UPDATE_WORKERS,
+        max_retries=retry or Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def create_api_session(gl):
+    """Create a keep-alive session for GitLab API calls, with retries on transient errors."""
+    session = create_http_session(Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]))
+    session.headers['PRIVATE-TOKEN'] = gl.private_token
+    return session
+
+
+def _file_url(api_base, project_id, path):
+    """Build the repository files API URL for a path (URL-encoded, as GitLab requires)."""
+    return f"{api_base}/{project_id}/repository/files/{quote(path, safe='')}"
+
+
+def _head_file(session, api_base, project_id, path, ref):
+    """Check whether a repository file exists with a HEAD request (no content download)."""
+    response = session.head(_file_url(api_base, project_id, path), params={'ref': ref})
+    return response.status_code in (200, 204)
+
+
+def _is_missing_file(response):
+    """Check whether a files API update failed because the file doesn't exist."""
+    if response.status_code == 404:
+        return True
+    return response.status_code == 400 and "doesn't exist" in response.text
+
+
+def _update_one(repo_name, gl, content, message, session, api_base, project=None, known_path=None):
+    """Update the CODEOWNERS file in a single repository.
+
+    The common case is handled by a single optimistic PUT to the path found on
+    a previous run (or CODEOWNERS at the repository root); the other locations
+    are only probed when that file is missing.
+
+    Returns:
+        Tuple of (repo_name, ok, codeowners_path)
+    """
+    # Existence is decided from response status codes; the only exceptions
+    # expected here are network-level or project lookup failures
+    try:
+        # Get the project (unless it was already fetched in bulk)
+        if project is None:
             project = gl.projects.get(repo_name)
 
-            # Get the default branch for this repository
-            default_branch = get_default_branch(project)
-            print(f"Default branch for {repo_name} is: {default_branch}")
+        # Get the default branch for this repository
+        default_branch = get_default_branch(project)
+        print(f"Default branch for {repo_name} is: {default_branch}")
+
+        # Update the file using the raw API endpoints
+        # This approach bypasses the automatic base64 encoding
+        data = {
+            'branch': default_branch,
+            'content': content,
+            'commit_message': message
+        }
 
-            # Try to find existing CODEOWNERS file
-            codeowners_path = None
-            for path in ["CODEOWNERS", ".gitlab/CODEOWNERS", "docs/CODEOWNERS"]:
-                try:
-                    project.files.get(path, ref=default_branch)
-                    codeowners_path = path
+        # Optimistically update the last known (or preferred) location first
+        codeowners_path = known_path if known_path in CODEOWNERS_PATHS else CODEOWNERS_PATHS[0]
+        response = session.put(_file_url(api_base, project.id, codeowners_path), json=data)
+        action = "Updated existing"
+
+        if _is_missing_file(response):
+            # Not there: look for it in the other locations
+            existing_path = None
+            for path in CODEOWNERS_PATHS:
+                if path != codeowners_path and _head_file(session, api_base, project.id, path, default_branch):
+                    existing_path = path
                     break
-                except:
-                    continue
 
-            # Default path if not found
-            if not codeowners_path:
-                codeowners_path = "CODEOWNERS"
+            if existing_path:
+                codeowners_path = existing_path
+                response = session.put(_file_url(api_base, project.id, codeowners_path), json=data)
+            else:
+                # Create new file at the default path
+                codeowners_path = CODEOWNERS_PATHS[0]
+                response = session.post(_file_url(api_base, project.id, codeowners_path), json=data)
+                action = "Created new"
+    except Exception as e:
+        print(f"Error updating {repo_name}: {e}")
+        return repo_name, False, None
+
+    if response.status_code >= 400:
+        print(f"API error: {response.status_code} - {response.text}")
+        return repo_name, False, None
 
-            # Commit message (conventional commit format, all lowercase)
-            message = f"chore: update codeowners with new reviewer rotation"
+    print(f"{action} CODEOWNERS in {repo_name} ({codeowners_path})")
+    return repo_name, True, codeowners_path
 
-            try:
-                # Try to update existing file using the raw API endpoints
-                # This approach bypasses the automatic base64 encoding
-                headers = {'PRIVATE-TOKEN': project.manager.gitlab.private_token}
-                url = f"{project.manager.gitlab.url}/api/v4/projects/{project.id}/repository/files/{codeowners_path}"
-
-                data = {
-                    'branch': default_branch,
-                    'content': content,
-                    'commit_message': message
-                }
-
-                # Check if file exists
-                try:
-                    project.files.get(codeowners_path, ref=default_branch)
-                    # Update existing file
-                    response = requests.put(url, headers=headers, json=data)
-                    print(f"Updated existing CODEOWNERS in {repo_name}")
-                except gitlab.exceptions.GitlabGetError:
-                    # Create new file
-                    response = requests.post(url, headers=headers, json=data)
-                    print(f"Created new CODEOWNERS in {repo_name}")
-
-                if response.status_code >= 400:
-                    print(f"API error: {response.status_code} - {response.text}")
-                    failed.append(repo_name)
-                    continue
 
-            except Exception as e:
-                print(f"Error in API request: {e}")
-                failed.append(repo_name)
-                continue
+def update_repositories(gl, repo_names, reviewers, codeowners_paths=None, now=None):
+    """Update CODEOWNERS files in multiple repositories.
 
-            successful.append(repo_name)
-        except Exception as e:
-            print(f"Error updating {repo_name}: {e}")
-            failed.append(repo_name)
+    Repositories are independent, so they are updated concurrently.
+
+    Args:
+        gl: GitLab client instance
+        repo_names: Repositories to update
+        reviewers: Reviewers to assign
+        codeowners_paths: Optional {str(repo_name): path} of CODEOWNERS locations from
+            previous runs; updated in place with the paths written in this run
+        now: Rotation time shown in the CODEOWNERS header (defaults to the current time)
+    """
+    if codeowners_paths is None:
+        codeowners_paths = {}
+
+    # Generate new CODEOWNERS content
+    content = generate_codeowners_content(reviewers, now)
+
+    # Commit message (conventional commit format, all lowercase)
+    message = f"chore: update codeowners with new reviewer rotation"
+
+    if not repo_names:
+        return [], []
+
+    # Constant across repositories, so computed once
+    api_base = f"{gl.url.rstrip('/')}/api/v4/projects"
+
+    projects = prefetch_projects(gl, repo_names)
+
+    # One keep-alive session shared by all workers
+    with create_api_session(gl) as session:
+        with ThreadPoolExecutor(max_workers=min(MAX_UPDATE_WORKERS, len(repo_names))) as executor:
+            results = list(executor.map(
+                lambda repo_name: _update_one(
+                    repo_name, gl, content, message, session, api_base,
+                    projects.get(str(repo_name).lower()), codeowners_paths.get(str(repo_name))
+                ),
+                repo_names
+            ))
+
+    successful = [repo_name for repo_name, ok, _ in results if ok]
+    failed = [repo_name for repo_name, ok, _ in results if not ok]
+    # Keyed by str so numeric project IDs survive the JSON round trip of the saved state
+    codeowners_paths.update((str(repo_name), path) for repo_name, ok, path in results if ok)
 
     return successful, failed
 
@@ -357,9 +625,12 @@ def main():
     # Load configuration
     config = load_config(args.config)
 
-    # Setup GitLab client
+    # Single timestamp for this rotation (CODEOWNERS header and saved state)
+    now = datetime.now()
+
+    # Setup GitLab client (its session is shared by the concurrent project lookups)
     try:
-        gl = gitlab.Gitlab(url=config['gitlab']['url'], private_token=config['gitlab']['token'])
+        gl = gitlab.Gitlab(url=config['gitlab']['url'], private_token=config['gitlab']['token'], session=create_http_session())
         gl.auth()
         print(f"Authenticated with GitLab at {config['gitlab']['url']}")
     except Exception as e:
@@ -377,7 +648,8 @@ def main():
             print(f"  - {repo}")
     else:
         # Update repositories
-        successful, failed = update_repositories(gl, config['repositories'], next_reviewers)
+        codeowners_paths = config.get('_codeowners_paths', {})
+        successful, failed = update_repositories(gl, config['repositories'], next_reviewers, codeowners_paths, now)
 
         print(f"Updated {len(successful)} repositories successfully")
         if failed:
@@ -387,11 +659,12 @@ def main():
 
         # Create single state record with the updated rotation queue
         state = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "reviewers": next_reviewers,
             "successful_repos": successful,
             "failed_repos": failed,
-            "rotation_queue": config.get('_updated_rotation_queue', [])  # Store the updated queue
+            "rotation_queue": config.get('_updated_rotation_queue', []),  # Store the updated queue
+            "codeowners_paths": codeowners_paths  # Where each repository's CODEOWNERS lives
         }
 
         # Save state
@@ -0,0 +1,83 @@
+"""Tests for notify.py."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import notify  # noqa: E402
+
+
+class CacheTestCase(unittest.TestCase):
+    """Points the on-disk caches at a temporary directory."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = Path(tmp.name)
+        for name, file_name in (('CODEOWNERS_CACHE_FILE', 'codeowners.json'),
+                                ('SLACK_CHANNEL_CACHE_FILE', 'slack_channels.json')):
+            patcher = mock.patch.object(notify, name, self.cache_dir / file_name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class LoadConfigTest(unittest.TestCase):
+
+    def test_toml_config(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / 'config.toml'
+            config_path.write_text(
+                '[gitlab]\nurl = "https://gitlab.example.com"\ntoken = "${TEST_GITLAB_TOKEN}"\n'
+                '[notification]\nslack_token = "xoxb-test"\nfallback_channel = "reviews"\n'
+            )
+            with mock.patch.dict('os.environ', {'TEST_GITLAB_TOKEN': 'secret'}, clear=True):
+                config = notify.load_config(str(config_path))
+
+        self.assertEqual(config['gitlab'], {'url': 'https://gitlab.example.com', 'token': 'secret'})
+        self.assertEqual(config['notification']['fallback_channel'], 'reviews')
+
+
+class LoadCacheTest(CacheTestCase):
+
+    def test_non_object_json_is_treated_as_empty(self):
+        cache_file = self.cache_dir / 'cache.json'
+        for content in ('[]', '"x"', '1', 'null'):
+            with self.subTest(content=content):
+                cache_file.write_text(content)
+                self.assertEqual(notify.load_cache(cache_file), {})
+
+
+class FindCodeownersReviewersTest(CacheTestCase):
+
+    def test_non_object_cache_file_is_ignored(self):
+        notify.CODEOWNERS_CACHE_FILE.write_text('[]')
+        project = mock.Mock()
+        project.files.head.return_value = {'X-Gitlab-Blob-Id': 'abc123'}
+        project.files.raw.return_value = b'* @alice @bob\n'
+
+        self.assertEqual(notify.find_codeowners_reviewers(project, 'group/project', 'main'), ['alice', 'bob'])
+        self.assertEqual(
+            notify.load_cache(notify.CODEOWNERS_CACHE_FILE),
+            {'group/project@main:CODEOWNERS': {'sha': 'abc123', 'reviewers': ['alice', 'bob']}}
+        )
+
+
+class NotifySlackFallbackTest(CacheTestCase):
+
+    def test_non_object_channel_cache_is_ignored(self):
+        notify.SLACK_CHANNEL_CACHE_FILE.write_text('"x"')
+        slack_client = mock.Mock()
+        slack_client.chat_postMessage.return_value = {'ok': True, 'channel': 'C123'}
+        mr_info = {'repo': 'group/project', 'id': 1, 'title': 'Fix', 'url': 'https://example.com', 'author': 'dev'}
+
+        self.assertTrue(notify.notify_slack(slack_client, [], mr_info, fallback_channel='#reviews'))
+        self.assertEqual(slack_client.chat_postMessage.call_args.kwargs['channel'], 'reviews')
+        self.assertEqual(notify.load_cache(notify.SLACK_CHANNEL_CACHE_FILE), {'reviews': 'C123'})
+
+
+if __name__ == '__main__':
+    unittest.main()
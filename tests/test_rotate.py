@@ -0,0 +1,74 @@
+"""Tests for rotate.py."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import rotate  # noqa: E402
+
+
+def make_session(status_code=200):
+    """Build a fake API session whose requests all return the given status."""
+    session = mock.MagicMock()
+    session.__enter__.return_value = session
+    session.put.return_value = mock.Mock(status_code=status_code, text='')
+    return session
+
+
+def make_gitlab():
+    """Build a fake GitLab client returning a project for any lookup."""
+    gl = mock.MagicMock()
+    gl.url = 'https://gitlab.example.com'
+    gl.projects.get.side_effect = lambda ref: mock.Mock(id=ref if isinstance(ref, int) else 1, default_branch='main')
+    return gl
+
+
+class PrefetchProjectsTest(unittest.TestCase):
+
+    def test_numeric_ids_are_left_to_per_repo_lookup(self):
+        gl = make_gitlab()
+
+        self.assertEqual(rotate.prefetch_projects(gl, [12345, 67890]), {})
+        gl.groups.get.assert_not_called()
+
+
+class UpdateRepositoriesTest(unittest.TestCase):
+
+    def test_numeric_project_id(self):
+        gl = make_gitlab()
+        session = make_session()
+
+        with mock.patch.object(rotate, 'create_api_session', return_value=session):
+            successful, failed = rotate.update_repositories(gl, [12345], ['alice'])
+
+        self.assertEqual(successful, [12345])
+        self.assertEqual(failed, [])
+        gl.projects.get.assert_called_once_with(12345)
+
+    def test_codeowners_paths_for_numeric_id_survive_state_round_trip(self):
+        gl = make_gitlab()
+        codeowners_paths = {}
+
+        with mock.patch.object(rotate, 'create_api_session', return_value=make_session()):
+            rotate.update_repositories(gl, [12345], ['alice'], codeowners_paths)
+
+        state = {'codeowners_paths': codeowners_paths}
+        for use_orjson in {False, rotate.ORJSON_AVAILABLE}:
+            with self.subTest(orjson=use_orjson), mock.patch.object(rotate, 'ORJSON_AVAILABLE', use_orjson):
+                self.assertEqual(rotate.loads_state(rotate.dumps_state(state)), state)
+        loaded = rotate.loads_state(rotate.dumps_state(state))
+
+        # The saved path is used for the next run's optimistic update
+        loaded['codeowners_paths']['12345'] = 'docs/CODEOWNERS'
+        session = make_session()
+        with mock.patch.object(rotate, 'create_api_session', return_value=session):
+            rotate.update_repositories(gl, [12345], ['alice'], loaded['codeowners_paths'])
+
+        self.assertIn('docs%2FCODEOWNERS', session.put.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()